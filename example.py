@@ -5,13 +5,22 @@ pip3 install garth requests readchar
 export EMAIL=<your garmin email>
 export PASSWORD=<your garmin password>
 
+Menu options can also be piped in to run them without a keyboard:
+printf "1\n2\n" | ./example.py
+This needs stored login tokens or EMAIL/PASSWORD set, otherwise the
+login prompt reads the piped options as credentials.
+
 """
+import collections
 import datetime
 from datetime import timezone
+import functools
 import json
 import logging
 import os
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from getpass import getpass
 
 import readchar
@@ -42,6 +51,8 @@ api = None
 # Let's say we want to scrape all activities using switch menu_option "p". We change the values of the below variables, IE startdate days, limit,...
 today = datetime.date.today()
 startdate = today - datetime.timedelta(days=7)  # Select past week
+today_iso = today.isoformat()
+startdate_iso = startdate.isoformat()
 start = 0
 limit = 100
 start_badge = 1  # Badge related calls calls start counting at 1
@@ -49,6 +60,14 @@ activitytype = ""  # Possible values are: cycling, running, swimming, multi_spor
 activityfile = "MY_ACTIVITY.fit"  # Supported file types are: .fit .gpx .tcx
 weight = 89.6
 weightunit = "kg"
+max_concurrent_calls = 4  # Maximum number of API calls run in parallel
+progress_metrics = ["elevationGain", "duration", "distance", "movingDuration"]
+activity_download_formats = [  # Formats and file extensions used when downloading activities
+    (Garmin.ActivityDownloadFormat.GPX, "gpx"),
+    (Garmin.ActivityDownloadFormat.TCX, "tcx"),
+    (Garmin.ActivityDownloadFormat.ORIGINAL, "zip"),
+    (Garmin.ActivityDownloadFormat.CSV, "csv"),
+]
 # workout_example = """
 # {
 #     'workoutId': "random_id",
@@ -80,26 +99,26 @@ weightunit = "kg"
 menu_options = {
     "1": "Get full name",
     "2": "Get unit system",
-    "3": f"Get activity data for '{today.isoformat()}'",
-    "4": f"Get activity data for '{today.isoformat()}' (compatible with garminconnect-ha)",
-    "5": f"Get body composition data for '{today.isoformat()}' (compatible with garminconnect-ha)",
-    "6": f"Get body composition data for from '{startdate.isoformat()}' to '{today.isoformat()}' (to be compatible with garminconnect-ha)",
-    "7": f"Get stats and body composition data for '{today.isoformat()}'",
-    "8": f"Get steps data for '{today.isoformat()}'",
-    "9": f"Get heart rate data for '{today.isoformat()}'",
-    "0": f"Get training readiness data for '{today.isoformat()}'",
-    "-": f"Get daily step data for '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "/": f"Get body battery data for '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "!": f"Get floors data for '{startdate.isoformat()}'",
-    "?": f"Get blood pressure data for '{startdate.isoformat()}' to '{today.isoformat()}'",
-    ".": f"Get training status data for '{today.isoformat()}'",
-    "a": f"Get resting heart rate data for {today.isoformat()}'",
-    "b": f"Get hydration data for '{today.isoformat()}'",
-    "c": f"Get sleep data for '{today.isoformat()}'",
-    "d": f"Get stress data for '{today.isoformat()}'",
-    "e": f"Get respiration data for '{today.isoformat()}'",
-    "f": f"Get SpO2 data for '{today.isoformat()}'",
-    "g": f"Get max metric data (like vo2MaxValue and fitnessAge) for '{today.isoformat()}'",
+    "3": f"Get activity data for '{today_iso}'",
+    "4": f"Get activity data for '{today_iso}' (compatible with garminconnect-ha)",
+    "5": f"Get body composition data for '{today_iso}' (compatible with garminconnect-ha)",
+    "6": f"Get body composition data for from '{startdate_iso}' to '{today_iso}' (to be compatible with garminconnect-ha)",
+    "7": f"Get stats and body composition data for '{today_iso}'",
+    "8": f"Get steps data for '{today_iso}'",
+    "9": f"Get heart rate data for '{today_iso}'",
+    "0": f"Get training readiness data for '{today_iso}'",
+    "-": f"Get daily step data for '{startdate_iso}' to '{today_iso}'",
+    "/": f"Get body battery data for '{startdate_iso}' to '{today_iso}'",
+    "!": f"Get floors data for '{startdate_iso}'",
+    "?": f"Get blood pressure data for '{startdate_iso}' to '{today_iso}'",
+    ".": f"Get training status data for '{today_iso}'",
+    "a": f"Get resting heart rate data for {today_iso}'",
+    "b": f"Get hydration data for '{today_iso}'",
+    "c": f"Get sleep data for '{today_iso}'",
+    "d": f"Get stress data for '{today_iso}'",
+    "e": f"Get respiration data for '{today_iso}'",
+    "f": f"Get SpO2 data for '{today_iso}'",
+    "g": f"Get max metric data (like vo2MaxValue and fitnessAge) for '{today_iso}'",
     "h": "Get personal record for user",
     "i": "Get earned badges for user",
     "j": f"Get adhoc challenges data from start '{start}' and limit '{limit}'",
@@ -108,7 +127,7 @@ menu_options = {
     "m": f"Get non completed badge challenges data from '{start_badge}' and limit '{limit}'",
     "n": f"Get activities data from start '{start}' and limit '{limit}'",
     "o": "Get last activity",
-    "p": f"Download activities data by date from '{startdate.isoformat()}' to '{today.isoformat()}'",
+    "p": f"Download activities data by date from '{startdate_iso}' to '{today_iso}'",
     "r": f"Get all kinds of activities data from '{start}'",
     "s": f"Upload activity data from file '{activityfile}'",
     "t": "Get all kinds of Garmin device info",
@@ -116,41 +135,45 @@ menu_options = {
     "v": "Get future goals",
     "w": "Get past goals",
     "y": "Get all Garmin device alarms",
-    "x": f"Get Heart Rate Variability data (HRV) for '{today.isoformat()}'",
-    "z": f"Get progress summary from '{startdate.isoformat()}' to '{today.isoformat()}' for all metrics",
+    "x": f"Get Heart Rate Variability data (HRV) for '{today_iso}'",
+    "z": f"Get progress summary from '{startdate_iso}' to '{today_iso}' for all metrics",
     "A": "Get gear, the defaults, activity types and statistics",
-    "B": f"Get weight-ins from '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "C": f"Get daily weigh-ins for '{today.isoformat()}'",
-    "D": f"Delete all weigh-ins for '{today.isoformat()}'",
-    "E": f"Add a weigh-in of {weight}{weightunit} on '{today.isoformat()}'",
-    "F": f"Get virtual challenges/expeditions from '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "G": f"Get hill score data from '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "H": f"Get endurance score data from '{startdate.isoformat()}' to '{today.isoformat()}'",
-    "I": f"Get activities for date '{today.isoformat()}'",
+    "B": f"Get weight-ins from '{startdate_iso}' to '{today_iso}'",
+    "C": f"Get daily weigh-ins for '{today_iso}'",
+    "D": f"Delete all weigh-ins for '{today_iso}'",
+    "E": f"Add a weigh-in of {weight}{weightunit} on '{today_iso}'",
+    "F": f"Get virtual challenges/expeditions from '{startdate_iso}' to '{today_iso}'",
+    "G": f"Get hill score data from '{startdate_iso}' to '{today_iso}'",
+    "H": f"Get endurance score data from '{startdate_iso}' to '{today_iso}'",
+    "I": f"Get activities for date '{today_iso}'",
     "J": "Get race predictions",
-    "K": f"Get all day stress data for '{today.isoformat()}'",
-    "L": f"Add body composition for '{today.isoformat()}'",
+    "K": f"Get all day stress data for '{today_iso}'",
+    "L": f"Add body composition for '{today_iso}'",
     "M": "Set blood pressure '120,80,80,notes='Testing with example.py'",
     "N": "Get user profile/settings",
-    "O": f"Reload epoch data for {today.isoformat()}",
+    "O": f"Reload epoch data for {today_iso}",
     "P": "Get workouts 0-100, get and download last one to .FIT file",
     # "Q": "Upload workout from json data",
     "R": "Get solar data from your devices",
     "S": "Get pregnancy summary data",
     "T": "Add hydration data",
-    "U": f"Get Fitness Age data for {today.isoformat()}",
-    "V": f"Get daily wellness events data for {startdate.isoformat()}",
+    "U": f"Get Fitness Age data for {today_iso}",
+    "V": f"Get daily wellness events data for {startdate_iso}",
     "W": "Get userprofile settings",
     "Z": "Remove stored login tokens (logout)",
     "q": "Exit",
 }
 
 
+# Separators used when displaying API output
+header_dashes = "-" * 20
+text_dashes = "-" * 60
+
+
 def display_json(api_call, output):
     """Format API output for better readability."""
 
-    dashed = "-" * 20
-    header = f"{dashed} {api_call} {dashed}"
+    header = f"{header_dashes} {api_call} {header_dashes}"
     footer = "-" * len(header)
 
     print(header)
@@ -166,13 +189,80 @@ def display_json(api_call, output):
 def display_text(output):
     """Format API output for better readability."""
 
-    dashed = "-" * 60
-    header = f"{dashed}"
-    footer = "-" * len(header)
-
-    print(header)
+    print(text_dashes)
     print(json.dumps(output, indent=4))
-    print(footer)
+    print(text_dashes)
+
+
+def http_status(err):
+    """Return the HTTP status code behind a Garth or requests HTTP error."""
+
+    if isinstance(err, GarthHTTPError):
+        err = err.error
+    return err.response.status_code if err.response is not None else None
+
+
+def call_concurrently(api, api_calls):
+    """Run independent API calls in parallel.
+
+    Returns a (result, error) pair per call in call order, so one failing
+    call doesn't hide the results of the others. Only HTTP errors of a
+    single call are returned this way. Rate limiting, authentication and
+    any other errors are raised to stop the whole action.
+    """
+
+    # Refresh an expired token once, instead of in every worker thread
+    if not api.garth.oauth2_token or api.garth.oauth2_token.expired:
+        api.garth.refresh_oauth2()
+
+    with ThreadPoolExecutor(max_workers=max_concurrent_calls) as executor:
+        futures = [executor.submit(*api_call) for api_call in api_calls]
+    results = []
+    for future in futures:
+        err = future.exception()
+        if err is None:
+            results.append((future.result(), None))
+        elif isinstance(
+            err, (GarthHTTPError, requests.exceptions.HTTPError)
+        ) and http_status(err) not in (401, 403, 429):
+            results.append((None, err))
+        else:
+            raise err
+    return results
+
+
+@functools.lru_cache(maxsize=1)
+def get_devices(api):
+    """Return devices for the logged in account, cached for the session."""
+
+    return api.get_devices()
+
+
+@functools.lru_cache(maxsize=1)
+def get_device_last_used(api):
+    """Return the last used device for the logged in account, cached for the session."""
+
+    return api.get_device_last_used()
+
+
+# Read the umask once, so written files get the permissions a plain open() gives them
+umask = os.umask(0)
+os.umask(umask)
+
+
+def write_file(path, data):
+    """Write data to path through a temporary file, so a crash never leaves a partial file."""
+
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(fd, "wb" if isinstance(data, bytes) else "w") as fh:
+            fh.write(data)
+        # mkstemp() creates the file readable by its owner only
+        os.chmod(tmp_path, 0o666 & ~umask)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
 
 
 def get_credentials():
@@ -227,8 +317,7 @@ def init_api(email, password):
             # Encode Oauth1 and Oauth2 tokens to base64 string and safe to file for next login (alternative way)
             token_base64 = garmin.garth.dumps()
             dir_path = os.path.expanduser(tokenstore_base64)
-            with open(dir_path, "w") as token_file:
-                token_file.write(token_base64)
+            write_file(dir_path, token_base64)
             print(
                 f"Oauth tokens encoded as base64 string and saved to '{dir_path}' file for future use. (second method)\n"
             )
@@ -252,12 +341,30 @@ def get_mfa():
 
 def print_menu():
     """Print examples menu."""
-    for key in menu_options.keys():
-        print(f"{key} -- {menu_options[key]}")
-    print("Make your selection: ", end="", flush=True)
+    menu = "".join(f"{key} -- {value}\n" for key, value in menu_options.items())
+    sys.stdout.write(f"{menu}Make your selection: ")
+    sys.stdout.flush()
+
+
+@functools.cache
+def piped_options():
+    """Read all piped menu options from stdin at once."""
+
+    return collections.deque(sys.stdin.read().split())
+
+
+def read_option():
+    """Read the next menu option from the keyboard or from piped input."""
+
+    if sys.stdin.isatty():
+        return readchar.readkey()
 
+    # Exit when all piped options have been run
+    options = piped_options()
+    return options.popleft() if options else "q"
 
-def switch(api, i):
+
+def switch(api, i, description):
     """Run selected API call."""
 
     # Exit example program
@@ -268,7 +375,7 @@ def switch(api, i):
     # Skip requests if login failed
     if api:
         try:
-            print(f"\n\nExecuting: {menu_options[i]}\n")
+            print(f"\n\nExecuting: {description}\n")
 
             # USER BASICS
             if i == "1":
@@ -282,129 +389,129 @@ def switch(api, i):
             elif i == "3":
                 # Get activity data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_stats('{today.isoformat()}')",
-                    api.get_stats(today.isoformat()),
+                    f"api.get_stats('{today_iso}')",
+                    api.get_stats(today_iso),
                 )
             elif i == "4":
                 # Get activity data (to be compatible with garminconnect-ha)
                 display_json(
-                    f"api.get_user_summary('{today.isoformat()}')",
-                    api.get_user_summary(today.isoformat()),
+                    f"api.get_user_summary('{today_iso}')",
+                    api.get_user_summary(today_iso),
                 )
             elif i == "5":
                 # Get body composition data for 'YYYY-MM-DD' (to be compatible with garminconnect-ha)
                 display_json(
-                    f"api.get_body_composition('{today.isoformat()}')",
-                    api.get_body_composition(today.isoformat()),
+                    f"api.get_body_composition('{today_iso}')",
+                    api.get_body_composition(today_iso),
                 )
             elif i == "6":
                 # Get body composition data for multiple days 'YYYY-MM-DD' (to be compatible with garminconnect-ha)
                 display_json(
-                    f"api.get_body_composition('{startdate.isoformat()}', '{today.isoformat()}')",
-                    api.get_body_composition(startdate.isoformat(), today.isoformat()),
+                    f"api.get_body_composition('{startdate_iso}', '{today_iso}')",
+                    api.get_body_composition(startdate_iso, today_iso),
                 )
             elif i == "7":
                 # Get stats and body composition data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_stats_and_body('{today.isoformat()}')",
-                    api.get_stats_and_body(today.isoformat()),
+                    f"api.get_stats_and_body('{today_iso}')",
+                    api.get_stats_and_body(today_iso),
                 )
 
             # USER STATISTICS LOGGED
             elif i == "8":
                 # Get steps data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_steps_data('{today.isoformat()}')",
-                    api.get_steps_data(today.isoformat()),
+                    f"api.get_steps_data('{today_iso}')",
+                    api.get_steps_data(today_iso),
                 )
             elif i == "9":
                 # Get heart rate data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_heart_rates('{today.isoformat()}')",
-                    api.get_heart_rates(today.isoformat()),
+                    f"api.get_heart_rates('{today_iso}')",
+                    api.get_heart_rates(today_iso),
                 )
             elif i == "0":
                 # Get training readiness data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_training_readiness('{today.isoformat()}')",
-                    api.get_training_readiness(today.isoformat()),
+                    f"api.get_training_readiness('{today_iso}')",
+                    api.get_training_readiness(today_iso),
                 )
             elif i == "/":
                 # Get daily body battery data for 'YYYY-MM-DD' to 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_body_battery('{startdate.isoformat()}, {today.isoformat()}')",
-                    api.get_body_battery(startdate.isoformat(), today.isoformat()),
+                    f"api.get_body_battery('{startdate_iso}, {today_iso}')",
+                    api.get_body_battery(startdate_iso, today_iso),
                 )
                 # Get daily body battery event data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_body_battery_events('{startdate.isoformat()}, {today.isoformat()}')",
-                    api.get_body_battery_events(startdate.isoformat()),
+                    f"api.get_body_battery_events('{startdate_iso}, {today_iso}')",
+                    api.get_body_battery_events(startdate_iso),
                 )
             elif i == "?":
                 # Get daily blood pressure data for 'YYYY-MM-DD' to 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_blood_pressure('{startdate.isoformat()}, {today.isoformat()}')",
-                    api.get_blood_pressure(startdate.isoformat(), today.isoformat()),
+                    f"api.get_blood_pressure('{startdate_iso}, {today_iso}')",
+                    api.get_blood_pressure(startdate_iso, today_iso),
                 )
             elif i == "-":
                 # Get daily step data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_daily_steps('{startdate.isoformat()}, {today.isoformat()}')",
-                    api.get_daily_steps(startdate.isoformat(), today.isoformat()),
+                    f"api.get_daily_steps('{startdate_iso}, {today_iso}')",
+                    api.get_daily_steps(startdate_iso, today_iso),
                 )
             elif i == "!":
                 # Get daily floors data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_floors('{today.isoformat()}')",
-                    api.get_floors(today.isoformat()),
+                    f"api.get_floors('{today_iso}')",
+                    api.get_floors(today_iso),
                 )
             elif i == ".":
                 # Get training status data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_training_status('{today.isoformat()}')",
-                    api.get_training_status(today.isoformat()),
+                    f"api.get_training_status('{today_iso}')",
+                    api.get_training_status(today_iso),
                 )
             elif i == "a":
                 # Get resting heart rate data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_rhr_day('{today.isoformat()}')",
-                    api.get_rhr_day(today.isoformat()),
+                    f"api.get_rhr_day('{today_iso}')",
+                    api.get_rhr_day(today_iso),
                 )
             elif i == "b":
                 # Get hydration data 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_hydration_data('{today.isoformat()}')",
-                    api.get_hydration_data(today.isoformat()),
+                    f"api.get_hydration_data('{today_iso}')",
+                    api.get_hydration_data(today_iso),
                 )
             elif i == "c":
                 # Get sleep data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_sleep_data('{today.isoformat()}')",
-                    api.get_sleep_data(today.isoformat()),
+                    f"api.get_sleep_data('{today_iso}')",
+                    api.get_sleep_data(today_iso),
                 )
             elif i == "d":
                 # Get stress data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_stress_data('{today.isoformat()}')",
-                    api.get_stress_data(today.isoformat()),
+                    f"api.get_stress_data('{today_iso}')",
+                    api.get_stress_data(today_iso),
                 )
             elif i == "e":
                 # Get respiration data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_respiration_data('{today.isoformat()}')",
-                    api.get_respiration_data(today.isoformat()),
+                    f"api.get_respiration_data('{today_iso}')",
+                    api.get_respiration_data(today_iso),
                 )
             elif i == "f":
                 # Get SpO2 data for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_spo2_data('{today.isoformat()}')",
-                    api.get_spo2_data(today.isoformat()),
+                    f"api.get_spo2_data('{today_iso}')",
+                    api.get_spo2_data(today_iso),
                 )
             elif i == "g":
                 # Get max metric data (like vo2MaxValue and fitnessAge) for 'YYYY-MM-DD'
                 display_json(
-                    f"api.get_max_metrics('{today.isoformat()}')",
-                    api.get_max_metrics(today.isoformat()),
+                    f"api.get_max_metrics('{today_iso}')",
+                    api.get_max_metrics(today_iso),
                 )
             elif i == "h":
                 # Get personal record for user
@@ -451,124 +558,74 @@ def switch(api, i):
                 # Get activities data from startdate 'YYYY-MM-DD' to enddate 'YYYY-MM-DD', with (optional) activitytype
                 # Possible values are: cycling, running, swimming, multi_sport, fitness_equipment, hiking, walking, other
                 activities = api.get_activities_by_date(
-                    startdate.isoformat(), today.isoformat(), activitytype
+                    startdate_iso, today_iso, activitytype
                 )
 
                 # Download activities
                 for activity in activities:
-                    activity_start_time = datetime.datetime.strptime(
-                        activity["startTimeLocal"], "%Y-%m-%d %H:%M:%S"
+                    activity_start_time = datetime.datetime.fromisoformat(
+                        activity["startTimeLocal"]
                     ).strftime(
                         "%d-%m-%Y"
                     )  # Format as DD-MM-YYYY, for creating unique activity names for scraping
                     activity_id = activity["activityId"]
                     activity_name = activity["activityName"]
+                    output_base = f"./{activity_name}_{activity_start_time}_{activity_id}"
                     display_text(activity)
 
-                    print(
-                        f"api.download_activity({activity_id}, dl_fmt=api.ActivityDownloadFormat.GPX)"
-                    )
-                    gpx_data = api.download_activity(
-                        activity_id, dl_fmt=api.ActivityDownloadFormat.GPX
-                    )
-                    output_file = f"./{str(activity_name)}_{str(activity_start_time)}_{str(activity_id)}.gpx"
-                    with open(output_file, "wb") as fb:
-                        fb.write(gpx_data)
-                    print(f"Activity data downloaded to file {output_file}")
-
-                    print(
-                        f"api.download_activity({activity_id}, dl_fmt=api.ActivityDownloadFormat.TCX)"
-                    )
-                    tcx_data = api.download_activity(
-                        activity_id, dl_fmt=api.ActivityDownloadFormat.TCX
-                    )
-                    output_file = f"./{str(activity_name)}_{str(activity_start_time)}_{str(activity_id)}.tcx"
-                    with open(output_file, "wb") as fb:
-                        fb.write(tcx_data)
-                    print(f"Activity data downloaded to file {output_file}")
-
-                    print(
-                        f"api.download_activity({activity_id}, dl_fmt=api.ActivityDownloadFormat.ORIGINAL)"
-                    )
-                    zip_data = api.download_activity(
-                        activity_id, dl_fmt=api.ActivityDownloadFormat.ORIGINAL
-                    )
-                    output_file = f"./{str(activity_name)}_{str(activity_start_time)}_{str(activity_id)}.zip"
-                    with open(output_file, "wb") as fb:
-                        fb.write(zip_data)
-                    print(f"Activity data downloaded to file {output_file}")
-
-                    print(
-                        f"api.download_activity({activity_id}, dl_fmt=api.ActivityDownloadFormat.CSV)"
+                    # Download all formats of this activity in parallel
+                    downloads = call_concurrently(
+                        api,
+                        [
+                            (api.download_activity, activity_id, dl_fmt)
+                            for dl_fmt, _ in activity_download_formats
+                        ],
                     )
-                    csv_data = api.download_activity(
-                        activity_id, dl_fmt=api.ActivityDownloadFormat.CSV
-                    )
-                    output_file = f"./{str(activity_name)}_{str(activity_start_time)}_{str(activity_id)}.csv"
-                    with open(output_file, "wb") as fb:
-                        fb.write(csv_data)
-                    print(f"Activity data downloaded to file {output_file}")
+                    for (dl_fmt, extension), (activity_data, err) in zip(
+                        activity_download_formats, downloads
+                    ):
+                        print(
+                            f"api.download_activity({activity_id}, dl_fmt=api.ActivityDownloadFormat.{dl_fmt.name})"
+                        )
+                        if err:
+                            logger.error(err)
+                            continue
+                        output_file = f"{output_base}.{extension}"
+                        write_file(output_file, activity_data)
+                        print(f"Activity data downloaded to file {output_file}")
 
             elif i == "r":
-                # Get activities data from start and limit
-                activities = api.get_activities(start, limit)  # 0=start, 1=limit
-
-                # Get activity splits
-                first_activity_id = activities[0].get("activityId")
-
-                display_json(
-                    f"api.get_activity_splits({first_activity_id})",
-                    api.get_activity_splits(first_activity_id),
-                )
-
-                # Get activity typed splits
-
-                display_json(
-                    f"api.get_activity_typed_splits({first_activity_id})",
-                    api.get_activity_typed_splits(first_activity_id),
-                )
-                # Get activity split summaries for activity id
-                display_json(
-                    f"api.get_activity_split_summaries({first_activity_id})",
-                    api.get_activity_split_summaries(first_activity_id),
-                )
-
-                # Get activity weather data for activity
-                display_json(
-                    f"api.get_activity_weather({first_activity_id})",
-                    api.get_activity_weather(first_activity_id),
-                )
-
-                # Get activity hr timezones id
-                display_json(
-                    f"api.get_activity_hr_in_timezones({first_activity_id})",
-                    api.get_activity_hr_in_timezones(first_activity_id),
-                )
-
-                # Get activity details for activity id
-                display_json(
-                    f"api.get_activity_details({first_activity_id})",
-                    api.get_activity_details(first_activity_id),
-                )
-
-                # Get gear data for activity id
-                display_json(
-                    f"api.get_activity_gear({first_activity_id})",
-                    api.get_activity_gear(first_activity_id),
-                )
+                # Get the activity at start, only the first one is used
+                activities = api.get_activities(start, 1)
+
+                first_activity = activities[0]
+                first_activity_id = first_activity.get("activityId")
+
+                activity_calls = [
+                    api.get_activity_splits,  # Get activity splits
+                    api.get_activity_typed_splits,  # Get activity typed splits
+                    api.get_activity_split_summaries,  # Get activity split summaries
+                    api.get_activity_weather,  # Get activity weather data
+                    api.get_activity_hr_in_timezones,  # Get activity hr timezones
+                    api.get_activity_details,  # Get activity details
+                    api.get_activity_gear,  # Get gear data for activity
+                    api.get_activity,  # Activity data for activity id
+                ]
+                # Get exercise sets in case the activity is a strength_training
+                if first_activity["activityType"]["typeKey"] == "strength_training":
+                    activity_calls.append(api.get_activity_exercise_sets)
 
-                # Activity data for activity id
-                display_json(
-                    f"api.get_activity({first_activity_id})",
-                    api.get_activity(first_activity_id),
+                # These calls are independent, so fetch them in parallel
+                results = call_concurrently(
+                    api, [(api_call, first_activity_id) for api_call in activity_calls]
                 )
-
-                # Get exercise sets in case the activity is a strength_training
-                if activities[0]["activityType"]["typeKey"] == "strength_training":
-                    display_json(
-                        f"api.get_activity_exercise_sets({first_activity_id})",
-                        api.get_activity_exercise_sets(first_activity_id),
-                    )
+                for api_call, (result, err) in zip(activity_calls, results):
+                    if err:
+                        logger.error(err)
+                    else:
+                        display_json(
+                            f"api.{api_call.__name__}({first_activity_id})", result
+                        )
 
             elif i == "s":
                 try:
@@ -583,20 +640,24 @@ def switch(api, i):
             # DEVICES
             elif i == "t":
                 # Get Garmin devices
-                devices = api.get_devices()
+                devices = get_devices(api)
                 display_json("api.get_devices()", devices)
 
                 # Get device last used
-                device_last_used = api.get_device_last_used()
+                device_last_used = get_device_last_used(api)
                 display_json("api.get_device_last_used()", device_last_used)
 
-                # Get settings per device
-                for device in devices:
-                    device_id = device["deviceId"]
-                    display_json(
-                        f"api.get_device_settings({device_id})",
-                        api.get_device_settings(device_id),
-                    )
+                # Get settings for all devices in parallel
+                device_ids = [device["deviceId"] for device in devices]
+                device_settings = call_concurrently(
+                    api,
+                    [(api.get_device_settings, device_id) for device_id in device_ids],
+                )
+                for device_id, (settings, err) in zip(device_ids, device_settings):
+                    if err:
+                        logger.error(err)
+                    else:
+                        display_json(f"api.get_device_settings({device_id})", settings)
 
                 # Get primary training device information
                 primary_training_device = api.get_primary_training_device()
@@ -606,19 +667,19 @@ def switch(api, i):
 
             elif i == "R":
                 # Get solar data from Garmin devices
-                devices = api.get_devices()
+                devices = get_devices(api)
                 display_json("api.get_devices()", devices)
 
                 # Get device last used
-                device_last_used = api.get_device_last_used()
+                device_last_used = get_device_last_used(api)
                 display_json("api.get_device_last_used()", device_last_used)
 
                 # Get settings per device
                 for device in devices:
                     device_id = device["deviceId"]
                     display_json(
-                        f"api.get_device_solar_data({device_id}, {today.isoformat()})",
-                        api.get_device_solar_data(device_id, today.isoformat()),
+                        f"api.get_device_solar_data({device_id}, {today_iso})",
+                        api.get_device_solar_data(device_id, today_iso),
                     )
             # GOALS
             elif i == "u":
@@ -647,27 +708,35 @@ def switch(api, i):
             elif i == "x":
                 # Get Heart Rate Variability (hrv) data
                 display_json(
-                    f"api.get_hrv_data({today.isoformat()})",
-                    api.get_hrv_data(today.isoformat()),
+                    f"api.get_hrv_data({today_iso})",
+                    api.get_hrv_data(today_iso),
                 )
 
             elif i == "z":
-                # Get progress summary
-                for metric in [
-                    "elevationGain",
-                    "duration",
-                    "distance",
-                    "movingDuration",
-                ]:
-                    display_json(
-                        f"api.get_progress_summary_between_dates({today.isoformat()})",
-                        api.get_progress_summary_between_dates(
-                            startdate.isoformat(), today.isoformat(), metric
-                        ),
-                    )
+                # Get progress summary, fetching all metrics at once
+                summaries = call_concurrently(
+                    api,
+                    [
+                        (
+                            api.get_progress_summary_between_dates,
+                            startdate_iso,
+                            today_iso,
+                            metric,
+                        )
+                        for metric in progress_metrics
+                    ],
+                )
+                for summary, err in summaries:
+                    if err:
+                        logger.error(err)
+                    else:
+                        display_json(
+                            f"api.get_progress_summary_between_dates({today_iso})",
+                            summary,
+                        )
             # GEAR
             elif i == "A":
-                last_used_device = api.get_device_last_used()
+                last_used_device = get_device_last_used(api)
                 display_json("api.get_device_last_used()", last_used_device)
                 userProfileNumber = last_used_device["userProfileNumber"]
                 gear = api.get_gear(userProfileNumber)
@@ -676,31 +745,37 @@ def switch(api, i):
                     "api.get_gear_defaults()", api.get_gear_defaults(userProfileNumber)
                 )
                 display_json("api.get()", api.get_activity_types())
-                for gear in gear:
-                    uuid = gear["uuid"]
-                    name = gear["displayName"]
-                    display_json(
-                        f"api.get_gear_stats({uuid}) / {name}", api.get_gear_stats(uuid)
-                    )
+                # Fetch statistics for all gear in parallel
+                gear_stats = call_concurrently(
+                    api, [(api.get_gear_stats, item["uuid"]) for item in gear]
+                )
+                for item, (stats, err) in zip(gear, gear_stats):
+                    if err:
+                        logger.error(err)
+                    else:
+                        display_json(
+                            f"api.get_gear_stats({item['uuid']}) / {item['displayName']}",
+                            stats,
+                        )
 
             # WEIGHT-INS
             elif i == "B":
                 # Get weigh-ins data
                 display_json(
-                    f"api.get_weigh_ins({startdate.isoformat()}, {today.isoformat()})",
-                    api.get_weigh_ins(startdate.isoformat(), today.isoformat()),
+                    f"api.get_weigh_ins({startdate_iso}, {today_iso})",
+                    api.get_weigh_ins(startdate_iso, today_iso),
                 )
             elif i == "C":
                 # Get daily weigh-ins data
                 display_json(
-                    f"api.get_daily_weigh_ins({today.isoformat()})",
-                    api.get_daily_weigh_ins(today.isoformat()),
+                    f"api.get_daily_weigh_ins({today_iso})",
+                    api.get_daily_weigh_ins(today_iso),
                 )
             elif i == "D":
                 # Delete weigh-ins data for today
                 display_json(
-                    f"api.delete_weigh_ins({today.isoformat()}, delete_all=True)",
-                    api.delete_weigh_ins(today.isoformat(), delete_all=True),
+                    f"api.delete_weigh_ins({today_iso}, delete_all=True)",
+                    api.delete_weigh_ins(today_iso, delete_all=True),
                 )
             elif i == "E":
                 # Add a weigh-in
@@ -711,9 +786,13 @@ def switch(api, i):
 
                 # Add a weigh-in with timestamps
                 yesterday = today - datetime.timedelta(days=1) # Get yesterday's date
-                weigh_in_date = datetime.datetime.strptime(yesterday.isoformat(), "%Y-%m-%d")
-                local_timestamp = weigh_in_date.strftime('%Y-%m-%dT%H:%M:%S')
-                gmt_timestamp = weigh_in_date.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%S')
+                weigh_in_date = datetime.datetime.combine(yesterday, datetime.time())
+                local_timestamp = weigh_in_date.isoformat(timespec="seconds")
+                gmt_timestamp = (
+                    weigh_in_date.astimezone(timezone.utc)
+                    .replace(tzinfo=None)
+                    .isoformat(timespec="seconds")
+                )
 
                 display_json(
                     f"api.add_weigh_in_with_timestamps(weight={weight}, unitKey={weightunit}, dateTimestamp={local_timestamp}, gmtTimestamp={gmt_timestamp})",
@@ -729,28 +808,28 @@ def switch(api, i):
             elif i == "F":
                 # Get virtual challenges/expeditions
                 display_json(
-                    f"api.get_inprogress_virtual_challenges({startdate.isoformat()}, {today.isoformat()})",
+                    f"api.get_inprogress_virtual_challenges({startdate_iso}, {today_iso})",
                     api.get_inprogress_virtual_challenges(
-                        startdate.isoformat(), today.isoformat()
+                        startdate_iso, today_iso
                     ),
                 )
             elif i == "G":
                 # Get hill score data
                 display_json(
-                    f"api.get_hill_score({startdate.isoformat()}, {today.isoformat()})",
-                    api.get_hill_score(startdate.isoformat(), today.isoformat()),
+                    f"api.get_hill_score({startdate_iso}, {today_iso})",
+                    api.get_hill_score(startdate_iso, today_iso),
                 )
             elif i == "H":
                 # Get endurance score data
                 display_json(
-                    f"api.get_endurance_score({startdate.isoformat()}, {today.isoformat()})",
-                    api.get_endurance_score(startdate.isoformat(), today.isoformat()),
+                    f"api.get_endurance_score({startdate_iso}, {today_iso})",
+                    api.get_endurance_score(startdate_iso, today_iso),
                 )
             elif i == "I":
                 # Get activities for date
                 display_json(
-                    f"api.get_activities_fordate({today.isoformat()})",
-                    api.get_activities_fordate(today.isoformat()),
+                    f"api.get_activities_fordate({today_iso})",
+                    api.get_activities_fordate(today_iso),
                 )
             elif i == "J":
                 # Get race predictions
@@ -758,8 +837,8 @@ def switch(api, i):
             elif i == "K":
                 # Get all day stress data for date
                 display_json(
-                    f"api.get_all_day_stress({today.isoformat()})",
-                    api.get_all_day_stress(today.isoformat()),
+                    f"api.get_all_day_stress({today_iso})",
+                    api.get_all_day_stress(today_iso),
                 )
             elif i == "L":
                 # Add body composition
@@ -776,9 +855,9 @@ def switch(api, i):
                 visceral_fat_rating = None
                 bmi = 22.2
                 display_json(
-                    f"api.add_body_composition({today.isoformat()}, {weight}, {percent_fat}, {percent_hydration}, {visceral_fat_mass}, {bone_mass}, {muscle_mass}, {basal_met}, {active_met}, {physique_rating}, {metabolic_age}, {visceral_fat_rating}, {bmi})",
+                    f"api.add_body_composition({today_iso}, {weight}, {percent_fat}, {percent_hydration}, {visceral_fat_mass}, {bone_mass}, {muscle_mass}, {basal_met}, {active_met}, {physique_rating}, {metabolic_age}, {visceral_fat_rating}, {bmi})",
                     api.add_body_composition(
-                        today.isoformat(),
+                        today_iso,
                         weight=weight,
                         percent_fat=percent_fat,
                         percent_hydration=percent_hydration,
@@ -807,19 +886,20 @@ def switch(api, i):
             elif i == "O":
                 # Reload epoch data for date
                 display_json(
-                    f"api.request_reload({today.isoformat()})",
-                    api.request_reload(today.isoformat()),
+                    f"api.request_reload({today_iso})",
+                    api.request_reload(today_iso),
                 )
 
             # WORKOUTS
             elif i == "P":
-                workouts = api.get_workouts()
                 # Get workout 0-100
-                display_json("api.get_workouts()", api.get_workouts())
+                workouts = api.get_workouts()
+                display_json("api.get_workouts()", workouts)
 
                 # Get last fetched workout
-                workout_id = workouts[-1]["workoutId"]
-                workout_name = workouts[-1]["workoutName"]
+                last_workout = workouts[-1]
+                workout_id = last_workout["workoutId"]
+                workout_name = last_workout["workoutName"]
                 display_json(
                     f"api.get_workout_by_id({workout_id})",
                     api.get_workout_by_id(workout_id),
@@ -829,9 +909,8 @@ def switch(api, i):
                 print(f"api.download_workout({workout_id})")
                 workout_data = api.download_workout(workout_id)
 
-                output_file = f"./{str(workout_name)}.fit"
-                with open(output_file, "wb") as fb:
-                    fb.write(workout_data)
+                output_file = f"./{workout_name}.fit"
+                write_file(output_file, workout_data)
                 print(f"Workout data downloaded to file {output_file}")
 
             # elif i == "Q":
@@ -843,8 +922,8 @@ def switch(api, i):
             elif i == "V":
                 # Get all day wellness events for 7 days ago
                 display_json(
-                    f"api.get_all_day_events({today.isoformat()})",
-                    api.get_all_day_events(startdate.isoformat()),
+                    f"api.get_all_day_events({today_iso})",
+                    api.get_all_day_events(startdate_iso),
                 )
             # WOMEN'S HEALTH
             elif i == "S":
@@ -858,10 +937,8 @@ def switch(api, i):
             elif i == "T":
                 # Add hydration data for today
                 value_in_ml = 240
-                raw_date = datetime.date.today()
-                cdate = str(raw_date)
-                raw_ts = datetime.datetime.now()
-                timestamp = datetime.datetime.strftime(raw_ts, "%Y-%m-%dT%H:%M:%S.%f")
+                cdate = datetime.date.today().isoformat()
+                timestamp = datetime.datetime.now().isoformat(timespec="microseconds")
 
                 display_json(
                     f"api.add_hydration_data(value_in_ml={value_in_ml},cdate='{cdate}',timestamp='{timestamp}')",
@@ -873,8 +950,8 @@ def switch(api, i):
             elif i == "U":
                 # Get fitness age data
                 display_json(
-                    f"api.get_fitnessage_data({today.isoformat()})",
-                    api.get_fitnessage_data(today.isoformat()),
+                    f"api.get_fitnessage_data({today_iso})",
+                    api.get_fitnessage_data(today_iso),
                 )
 
             elif i == "W":
@@ -888,14 +965,18 @@ def switch(api, i):
                 tokendir = os.path.expanduser(tokenstore)
                 print(f"Removing stored login tokens from: {tokendir}")
                 try:
-                    for root, dirs, files in os.walk(tokendir, topdown=False):
-                        for name in files:
-                            os.remove(os.path.join(root, name))
-                        for name in dirs:
-                            os.rmdir(os.path.join(root, name))
+                    with os.scandir(tokendir) as entries:
+                        for entry in entries:
+                            os.unlink(entry.path)
+                    os.rmdir(tokendir)
                     print(f"Directory {tokendir} removed")
                 except FileNotFoundError:
                     print(f"Directory not found: {tokendir}")
+                except OSError as err:
+                    logger.error(err)
+                # Forget cached account data, so the next login fetches it again
+                get_devices.cache_clear()
+                get_device_last_used.cache_clear()
                 api = None
 
         except (
@@ -906,9 +987,9 @@ def switch(api, i):
             GarthHTTPError,
         ) as err:
             logger.error(err)
-        except KeyError:
-            # Invalid menu option chosen
-            pass
+        except KeyError as err:
+            # Unexpected response layout from the API
+            logger.error("Missing key in API response: %s", err)
     else:
         print("Could not login to Garmin Connect, try again later.")
 
@@ -925,7 +1006,14 @@ while True:
     if api:
         # Display menu
         print_menu()
-        option = readchar.readkey()
-        switch(api, option)
+        option = read_option()
+        # Wait for a valid key instead of redrawing everything on a typo
+        while True:
+            try:
+                description = menu_options[option]
+                break
+            except KeyError:
+                option = read_option()
+        switch(api, option, description)
     else:
         api = init_api(email, password)
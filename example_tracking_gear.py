@@ -10,7 +10,10 @@ import datetime
 import json
 import logging
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from getpass import getpass
+from operator import itemgetter
 
 import requests
 from garth.exc import GarthHTTPError
@@ -47,11 +50,15 @@ weightunit = "kg"
 gearUUID = "MY_GEAR_UUID"
 
 
+# Separators used when displaying API output
+header_dashes = "-" * 20
+text_dashes = "-" * 60
+
+
 def display_json(api_call, output):
     """Format API output for better readability."""
 
-    dashed = "-" * 20
-    header = f"{dashed} {api_call} {dashed}"
+    header = f"{header_dashes} {api_call} {header_dashes}"
     footer = "-" * len(header)
 
     print(header)
@@ -67,13 +74,9 @@ def display_json(api_call, output):
 def display_text(output):
     """Format API output for better readability."""
 
-    dashed = "-" * 60
-    header = f"{dashed}"
-    footer = "-" * len(header)
-
-    print(header)
+    print(text_dashes)
     print(json.dumps(output, indent=4))
-    print(footer)
+    print(text_dashes)
 
 
 def get_credentials():
@@ -151,10 +154,12 @@ def get_mfa():
     return input("MFA one-time code: ")
 
 
-def format_timedelta(td):
-    minutes, seconds = divmod(td.seconds + td.days * 86400, 60)
-    hours, minutes = divmod(minutes, 60)
-    return "{:d}:{:02d}:{:02d}".format(hours, minutes, seconds)
+def format_duration(seconds):
+    """Format a duration in seconds as H:MM:SS."""
+
+    hours, seconds = divmod(int(seconds), 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours:d}:{minutes:02d}:{seconds:02d}"
 
 
 def gear(api):
@@ -163,30 +168,29 @@ def gear(api):
     # Skip requests if login failed
     if api:
         try:
-            display_json(
-                f"api.get_gear_stats({gearUUID})",
-                api.get_gear_stats(gearUUID),
-            )
-            activityList = api.get_gear_ativities(gearUUID)
+            # Stats and activities don't depend on each other, fetch them in parallel
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                gear_stats = executor.submit(api.get_gear_stats, gearUUID)
+                gear_activities = executor.submit(api.get_gear_ativities, gearUUID)
+            display_json(f"api.get_gear_stats({gearUUID})", gear_stats.result())
+            activityList = gear_activities.result()
             if len(activityList) == 0:
                 print("No activities found for the given gear uuid.")
             else:
-                print("Found " + str(len(activityList)) + " activities.")
-
-            D = 0
-            for a in activityList:
-                print(
-                    "Activity: "
-                    + a["startTimeLocal"]
-                    + (" | " + a["activityName"] if a["activityName"] else "")
-                )
-                print(
-                    "  Duration: "
-                    + format_timedelta(datetime.timedelta(seconds=a["duration"]))
-                )
-                D += a["duration"]
+                print(f"Found {len(activityList)} activities.")
+
+            # Collect all activity lines and write them in one go
+            lines = []
+            total_duration = 0
+            get_fields = itemgetter("startTimeLocal", "activityName", "duration")
+            for start_time, activity_name, duration in map(get_fields, activityList):
+                name = f" | {activity_name}" if activity_name else ""
+                lines.append(f"Activity: {start_time}{name}\n")
+                lines.append(f"  Duration: {format_duration(duration)}\n")
+                total_duration += duration
+            sys.stdout.write("".join(lines))
             print("")
-            print("Total Duration: " + format_timedelta(datetime.timedelta(seconds=D)))
+            print(f"Total Duration: {format_duration(total_duration)}")
             print("")
             print("Done!")
         except (
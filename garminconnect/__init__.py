@@ -474,7 +474,7 @@ class Garmin:
 
         daily_weigh_ins = self.get_daily_weigh_ins(cdate)
         weigh_ins = daily_weigh_ins.get("dateWeightList", [])
-        if not weigh_ins or len(weigh_ins) == 0:
+        if not weigh_ins:
             logger.warning(f"No weigh-ins found on {cdate}")
             return
         elif len(weigh_ins) > 1:
@@ -601,12 +601,12 @@ class Garmin:
             cdate = str(raw_date)
 
             raw_ts = datetime.now()
-            timestamp = datetime.strftime(raw_ts, "%Y-%m-%dT%H:%M:%S.%f")
+            timestamp = raw_ts.isoformat(timespec="microseconds")
 
         elif cdate is not None and timestamp is None:
             # If cdate is not null, use timestamp associated with midnight
             raw_ts = datetime.strptime(cdate, "%Y-%m-%d")
-            timestamp = datetime.strftime(raw_ts, "%Y-%m-%dT%H:%M:%S.%f")
+            timestamp = raw_ts.isoformat(timespec="microseconds")
 
         elif cdate is None and timestamp is not None:
             # If timestamp is not null, set cdate equal to date part of timestamp
@@ -827,22 +827,16 @@ class Garmin:
 
         valid = {"daily", "monthly", None}
         if _type not in valid:
-            raise ValueError("results: _type must be one of %r." % valid)
+            raise ValueError(f"results: _type must be one of {valid!r}.")
 
         if _type is None and startdate is None and enddate is None:
-            url = (
-                self.garmin_connect_race_predictor_url
-                + f"/latest/{self.display_name}"
-            )
+            url = f"{self.garmin_connect_race_predictor_url}/latest/{self.display_name}"
             return self.connectapi(url)
 
         elif (
             _type is not None and startdate is not None and enddate is not None
         ):
-            url = (
-                self.garmin_connect_race_predictor_url
-                + f"/{_type}/{self.display_name}"
-            )
+            url = f"{self.garmin_connect_race_predictor_url}/{_type}/{self.display_name}"
             params = {
                 "fromCalendarDate": str(startdate),
                 "toCalendarDate": str(enddate),
@@ -1063,11 +1057,14 @@ class Garmin:
         )
 
         if allowed_file_extension:
-            files = {
-                "file": (file_base_name, open(activity_path, "rb" or "r")),
-            }
-            url = self.garmin_connect_upload
-            return self.garth.post("connectapi", url, files=files, api=True)
+            with open(activity_path, "rb") as activity_file:
+                files = {
+                    "file": (file_base_name, activity_file),
+                }
+                url = self.garmin_connect_upload
+                return self.garth.post(
+                    "connectapi", url, files=files, api=True
+                )
         else:
             raise GarminConnectInvalidFileFormatError(
                 f"Could not upload {activity_path}"